@@ -1,12 +1,9 @@
 from flask import Flask, render_template, request, jsonify
-from pydub import AudioSegment
-import io
-import subprocess
 from datetime import datetime
 import azure.cognitiveservices.speech as speechsdk
-import json
 import os
-from dataclasses import dataclass, asdict
+from dotenv import load_dotenv
+from dataclasses import dataclass
 from typing import List, Dict, Optional
 import logging
 from threading import Lock
@@ -38,12 +35,19 @@ def rate_limit(max_requests: int, time_window: float):
         return wrapped
     return decorator
 
-@dataclass
+@dataclass(slots=True)
 class Speaker:
     name: str
     voice_profile_id: str
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
+
+    @property
+    def first_name(self) -> str:
+        return self.name.split(' ', 1)[0]
+
+    @property
+    def last_name(self) -> str:
+        parts = self.name.split(' ', 1)
+        return parts[1] if len(parts) > 1 else ''
 
 @dataclass
 class TranscriptEntry:
@@ -52,19 +56,10 @@ class TranscriptEntry:
     speaker: Optional[str]
 
 class SpeakerRecognitionSystem:
-    def __init__(self, speech_key: str, service_region: str):
-        self.speech_key = speech_key
-        self.service_region = service_region
-        self.audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
+    def __init__(self, speech_config: speechsdk.SpeechConfig):
+        self.speech_config = speech_config
         self.speakers: Dict[str, Speaker] = {}
         self.transcript: List[TranscriptEntry] = []
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=speech_key, 
-            region=service_region
-        )
-        self.speech_config.set_speech_synthesis_output_format(
-            speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm
-        )
 
     def create_speaker_profile(self):
         try:
@@ -97,13 +92,7 @@ class SpeakerRecognitionSystem:
             enrollment_result = client.enroll_profile(speechsdk.EnrollmentConfig(profile_id, audio_config))
 
             if enrollment_result.reason == speechsdk.ResultReason.EnrolledVoiceProfile:
-                first_name, last_name = name.split(' ', 1)
-                speaker = Speaker(
-                    name=name,
-                    voice_profile_id=profile_id,
-                    first_name=first_name,
-                    last_name=last_name
-                )
+                speaker = Speaker(name=name, voice_profile_id=profile_id)
                 self.speakers[profile_id] = speaker
                 return True
             return False
@@ -173,9 +162,13 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 
 # Initialize the speaker recognition system
-AZURE_SPEECH_KEY = '6cAl3kwaMdSgoseJv8CRcLSRce8kPI2s36tEMRKpFKUZAQoZaqELJQQJ99BAACYeBjFXJ3w3AAAYACOGTM3z'
-AZURE_SPEECH_REGION = 'eastus'
-speaker_system = SpeakerRecognitionSystem(AZURE_SPEECH_KEY, AZURE_SPEECH_REGION)
+# Credentials come from the environment (or a local .env file), never the source
+load_dotenv()
+AZURE_SPEECH_KEY = os.environ['AZURE_SPEECH_KEY']
+AZURE_SPEECH_REGION = os.environ.get('AZURE_SPEECH_REGION', 'eastus')
+# Built once and shared by every recognizer and client; the SDK only reads it
+SPEECH_CONFIG = speechsdk.SpeechConfig(subscription=AZURE_SPEECH_KEY, region=AZURE_SPEECH_REGION)
+speaker_system = SpeakerRecognitionSystem(SPEECH_CONFIG)
 
 @app.route('/')
 def index():
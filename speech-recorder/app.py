@@ -1,78 +1,241 @@
-from flask import Flask, render_template, request, jsonify
-from pydub import AudioSegment
+from quart import Quart, render_template, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+import orjson
+import asyncio
 import io
-import subprocess
+import hashlib
 from datetime import datetime
 import azure.cognitiveservices.speech as speechsdk
-import json
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from dotenv import load_dotenv
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Deque, List, Dict, Optional, Tuple
 import logging
 from threading import Lock
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from functools import wraps
-from time import time
-from collections import deque
+from itertools import islice
+from time import monotonic
+from collections import deque, OrderedDict
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'last', 'rate', 'cap', 'lock')
+
+    def __init__(self, rate: float, cap: float):
+        self.rate = rate
+        self.cap = cap
+        self.tokens = cap
+        self.last = monotonic()
+        self.lock = Lock()
+
+    def consume(self) -> bool:
+        now = monotonic()
+        with self.lock:
+            self.tokens = min(self.cap, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
 
 
 # Add rate limiting to work within free tier limits
 def rate_limit(max_requests: int, time_window: float):
-    requests = deque()
-    lock = Lock()
+    bucket = TokenBucket(rate=max_requests / time_window, cap=max_requests)
 
     def decorator(f):
         @wraps(f)
-        def wrapped(*args, **kwargs):
-            with lock:
-                now = time()
-                while requests and requests[0] < now - time_window:
-                    requests.popleft()
-
-                if len(requests) >= max_requests:
-                    return jsonify({
-                        'error': 'Rate limit exceeded. Please wait before sending more audio.'
-                    }), 429
-
-                requests.append(now)
-            return f(*args, **kwargs)
+        async def wrapped(*args, **kwargs):
+            if not bucket.consume():
+                return jsonify({
+                    'error': 'Rate limit exceeded. Please wait before sending more audio.'
+                }), 429
+            return await f(*args, **kwargs)
         return wrapped
     return decorator
 
 
-@dataclass
+@dataclass(slots=True)
 class Speaker:
     name: str
     voice_profile_id: str
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
 
+    @property
+    def first_name(self) -> str:
+        return self.name.split(' ', 1)[0]
+
+    @property
+    def last_name(self) -> str:
+        parts = self.name.split(' ', 1)
+        return parts[1] if len(parts) > 1 else ''
 
-@dataclass
+
+@dataclass(slots=True)
 class TranscriptEntry:
     timestamp: float
     text: str
     speaker: Optional[str]
+    formatted_time: str
+
+
+# Oldest transcript entries are dropped beyond this many
+TRANSCRIPT_MAX_ENTRIES = 10000
+
+# Azure's default input format: 16 kHz, 16-bit, mono PCM
+AZURE_SAMPLE_RATE = 16000
+AZURE_SAMPLE_WIDTH = 2
+SILENCE_THRESHOLD_DBFS = -40.0
+
+# webrtcvad only accepts 10/20/30 ms frames; 2 is its middle aggressiveness
+VAD_AGGRESSIVENESS = 2
+VAD_FRAME_BYTES = AZURE_SAMPLE_RATE * AZURE_SAMPLE_WIDTH * 30 // 1000
+
+
+# Convert an uploaded WAV to raw PCM in Azure's input format, minus silent edges.
+# Raises ValueError if the upload can't be decoded. PCM WAVs are decoded in
+# Python; anything else (corrupt, float or compressed WAVs) needs ffmpeg and
+# ffprobe on the PATH, and without them is rejected the same way.
+def preprocess_audio(audio_source: BinaryIO) -> bytes:
+    # pydub pulls in audioop and probes for ffmpeg on import, so only load it
+    # once there is audio to convert
+    from pydub import AudioSegment
+    from pydub.exceptions import CouldntDecodeError
+    from pydub.silence import detect_leading_silence
+
+    try:
+        segment = AudioSegment.from_file(audio_source, format='wav')
+    except (CouldntDecodeError, OSError) as e:
+        # OSError covers pydub's fallback failing to run ffmpeg/ffprobe
+        raise ValueError(str(e) or type(e).__name__) from e
+    segment = (
+        segment.set_frame_rate(AZURE_SAMPLE_RATE)
+        .set_channels(1)
+        .set_sample_width(AZURE_SAMPLE_WIDTH)
+    )
+    start = detect_leading_silence(segment, silence_threshold=SILENCE_THRESHOLD_DBFS)
+    end = len(segment) - detect_leading_silence(segment.reverse(), silence_threshold=SILENCE_THRESHOLD_DBFS)
+    return segment[start:end].raw_data
+
+
+# Drop the non-speech frames from PCM audio in Azure's input format. Silence
+# gives speaker recognition nothing to work with and is what trips Azure's
+# "client buffer exceeded" resets on long clips.
+def strip_non_speech(pcm: bytes) -> bytes:
+    # webrtcvad is a C extension; if it isn't installed, identification still
+    # works on the unfiltered audio, just less reliably on long clips
+    try:
+        import webrtcvad
+    except ImportError as e:
+        logging.warning(f"Voice activity detection unavailable, using unfiltered audio: {str(e)}")
+        return pcm
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    frames = (
+        pcm[i:i + VAD_FRAME_BYTES]
+        for i in range(0, len(pcm) - VAD_FRAME_BYTES + 1, VAD_FRAME_BYTES)
+    )
+    return b''.join(frame for frame in frames if vad.is_speech(frame, AZURE_SAMPLE_RATE))
+
+
+class ByteStreamCallback(speechsdk.audio.PullAudioInputStreamCallback):
+    # Lets the SDK pull audio at its own pace. Pushing a whole clip at once is
+    # faster than realtime and trips Azure's "client buffer exceeded" reset.
+    def __init__(self, audio: bytes):
+        super().__init__()
+        self._audio = io.BytesIO(audio)
+
+    def read(self, buffer: memoryview) -> int:
+        return self._audio.readinto(buffer) or 0
+
+    def close(self):
+        self._audio.close()
+
+
+def pull_audio_config(audio: bytes) -> speechsdk.audio.AudioConfig:
+    stream = speechsdk.audio.PullAudioInputStream(ByteStreamCallback(audio))
+    return speechsdk.audio.AudioConfig(stream=stream)
+
+
+# Speaker identifications run on a small pool so concurrent requests overlap
+# without opening an unbounded number of SpeakerRecognizer sessions. The SDK
+# gives no way to abort a call, so a request stops waiting after the timeout
+# but the call keeps its thread until Azure answers; once every thread is
+# busy, new identifications are skipped rather than queued behind them.
+SPEAKER_ID_MAX_SESSIONS = 8
+SPEAKER_ID_TIMEOUT = 15.0
+
+# Recognition results are cached by audio fingerprint so a re-submitted clip
+# skips the Azure round-trip. Failed results only stick around briefly.
+RESULT_CACHE_SIZE = 512
+FAILED_RESULT_TTL = 30.0
+
+
+def audio_fingerprint(audio: bytes) -> bytes:
+    return hashlib.blake2b(audio, digest_size=16).digest()
+
+
+def cache_by_fingerprint(failed: Callable[[object], bool] = lambda result: result is None):
+    def decorator(f):
+        @wraps(f)
+        def wrapped(self, audio, *args, **kwargs):
+            key = (f.__name__, audio_fingerprint(audio))
+            with self._result_cache_lock:
+                generation = self._result_cache_generation
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    expires, result = cached
+                    if expires is None or expires > monotonic():
+                        self._result_cache.move_to_end(key)
+                        return result
+                    del self._result_cache[key]
+
+            result = f(self, audio, *args, **kwargs)
+
+            expires = monotonic() + FAILED_RESULT_TTL if failed(result) else None
+            with self._result_cache_lock:
+                # An enrollment while f ran may have made this result stale
+                if generation != self._result_cache_generation:
+                    return result
+                self._result_cache[key] = (expires, result)
+                self._result_cache.move_to_end(key)
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            return result
+        return wrapped
+    return decorator
 
 
 class SpeakerRecognitionSystem:
-    def __init__(self, speech_key: str, service_region: str):
-        self.speech_key = speech_key
-        self.service_region = service_region
-        self.audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
+    def __init__(self, speech_config: speechsdk.SpeechConfig):
+        self.speech_config = speech_config
         self.speakers: Dict[str, Speaker] = {}
-        self.transcript: List[TranscriptEntry] = []
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=speech_key,
-            region=service_region
-        )
-        self.speech_config.set_speech_synthesis_output_format(
-            speechsdk.SpeechSynthesisOutputFormat.Riff16Khz16BitMonoPcm
+        self.transcript: Deque[TranscriptEntry] = deque(maxlen=TRANSCRIPT_MAX_ENTRIES)
+        self._formatted_cache: List[Dict] = []
+        self._entries_added = 0
+        self._entries_formatted = 0
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_lock = Lock()
+        self._result_cache_generation = 0
+        self._model_version = 0
+        self._cached_model = (-1, None)
+        # One profile client serves every create/enroll call instead of a new
+        # connection per call. It is built on first use so an SDK without
+        # speaker recognition only breaks enrollment, not the whole app.
+        self._profile_client = None
+        self._identify_pool = ThreadPoolExecutor(
+            max_workers=SPEAKER_ID_MAX_SESSIONS, thread_name_prefix='speaker-identify'
         )
+        self._identify_lock = Lock()
+        self._identify_in_flight = 0
+
+    def _get_profile_client(self):
+        if self._profile_client is None:
+            self._profile_client = speechsdk.VoiceProfileClient(self.speech_config)
+        return self._profile_client
 
     def create_speaker_profile(self):
         try:
-            client = speechsdk.VoiceProfileClient(self.speech_config)
-            result = client.create_profile(speechsdk.VoiceProfileType.TextIndependentIdentification, locale="en-us")
+            result = self._get_profile_client().create_profile(speechsdk.VoiceProfileType.TextIndependentIdentification, locale="en-us")
             if result.reason == speechsdk.ResultReason.CreatedVoiceProfile:
                 return result.voice_profile_id
             else:
@@ -82,63 +245,128 @@ class SpeakerRecognitionSystem:
             logging.error(f"Error creating speaker profile: {str(e)}")
             raise
 
+    # audio_stream is an uploaded WAV file; it is converted to Azure's PCM
+    # format before silence is stripped, the same as uploads to /process_audio
     def enroll_speaker(self, audio_stream: bytes, name: str) -> bool:
         try:
             if len(self.speakers) >= 50:
                 logging.warning("Maximum speaker limit reached for free tier")
                 return False
 
+            try:
+                audio_stream = preprocess_audio(io.BytesIO(audio_stream))
+            except ValueError as e:
+                logging.warning(f"Invalid enrollment audio: {str(e)}")
+                return False
+            audio_stream = strip_non_speech(audio_stream)
+            if not audio_stream:
+                logging.warning("No speech found in enrollment audio")
+                return False
+
             profile_id = self.create_speaker_profile()
             if not profile_id:
                 return False
 
-            client = speechsdk.VoiceProfileClient(self.speech_config)
-            stream = speechsdk.audio.PushAudioInputStream()
-            stream.write(audio_stream)
-            audio_config = speechsdk.audio.AudioConfig(stream=stream)
+            audio_config = pull_audio_config(audio_stream)
 
-            enrollment_result = client.enroll_profile(speechsdk.EnrollmentConfig(profile_id, audio_config))
+            enrollment_result = self._get_profile_client().enroll_profile(speechsdk.EnrollmentConfig(profile_id, audio_config))
 
             if enrollment_result.reason == speechsdk.ResultReason.EnrolledVoiceProfile:
-                first_name, last_name = name.split(' ', 1)
-                speaker = Speaker(
-                    name=name,
-                    voice_profile_id=profile_id,
-                    first_name=first_name,
-                    last_name=last_name
-                )
+                speaker = Speaker(name=name, voice_profile_id=profile_id)
                 self.speakers[profile_id] = speaker
+                self._model_version += 1
+                # Cached identifications no longer reflect the enrolled speakers
+                with self._result_cache_lock:
+                    self._result_cache.clear()
+                    self._result_cache_generation += 1
                 return True
             return False
         except Exception as e:
             logging.error(f"Error enrolling speaker: {str(e)}")
             return False
 
-    def identify_speaker(self, audio_stream: bytes) -> Optional[Speaker]:
-        try:
-            stream = speechsdk.audio.PushAudioInputStream()
-            stream.write(audio_stream)
-            audio_config = speechsdk.audio.AudioConfig(stream=stream)
+    def _identification_model(self):
+        # Only rebuild the model when the set of enrolled speakers has changed.
+        # Speaker-recognition SDK names stay out of import-time code so the app
+        # still starts (and transcribes) with SDK builds that lack them.
+        # The version is read before the profile list so a speaker enrolled
+        # mid-build leaves the model stamped stale and it is rebuilt next time.
+        # Model and version are stored as one tuple so concurrent rebuilds
+        # can't pair one thread's model with another's version.
+        version = self._model_version
+        cached_version, model = self._cached_model
+        if cached_version != version:
+            profile_ids = [speaker.voice_profile_id for speaker in list(self.speakers.values())]
+            model = speechsdk.SpeakerIdentificationModel(profile_ids)
+            self._cached_model = (version, model)
+        return model
 
-            recognizer = speechsdk.SpeakerRecognizer(self.speech_config, audio_config)
+    def _recognize_speaker(self, audio_stream: bytes) -> Optional[str]:
+        # Runs on one of the identify pool's threads
+        audio_config = pull_audio_config(audio_stream)
 
-            profile_ids = [speaker.voice_profile_id for speaker in self.speakers.values()]
-            model = speechsdk.SpeakerIdentificationModel(profile_ids)
+        recognizer = speechsdk.SpeakerRecognizer(self.speech_config, audio_config)
+
+        model = self._identification_model()
 
-            result = recognizer.recognize_speaker_async(model).get()
+        result = recognizer.recognize_speaker_async(model).get()
 
-            if result.reason == speechsdk.ResultReason.RecognizedSpeaker:
-                return self.speakers.get(result.profile_id)
+        if result.reason == speechsdk.ResultReason.RecognizedSpeaker:
+            return result.profile_id
+        return None
+
+    def _identification_finished(self, future: Future):
+        with self._identify_lock:
+            self._identify_in_flight -= 1
+
+    def _submit_identification(self, audio: bytes) -> Optional[Future]:
+        # Returns None instead of queuing when every pool thread is taken,
+        # which after timeouts means they are stuck waiting on Azure
+        with self._identify_lock:
+            if self._identify_in_flight >= SPEAKER_ID_MAX_SESSIONS:
+                logging.warning(
+                    f"Speaker identification pool saturated ({self._identify_in_flight} calls in flight), skipping identification"
+                )
+                return None
+            self._identify_in_flight += 1
+        try:
+            future = self._identify_pool.submit(self._recognize_speaker, audio)
+        except Exception:
+            with self._identify_lock:
+                self._identify_in_flight -= 1
+            raise
+        future.add_done_callback(self._identification_finished)
+        return future
+
+    def _identification_result(self, future: Future) -> Optional[str]:
+        try:
+            return future.result(timeout=SPEAKER_ID_TIMEOUT)
+        except FutureTimeoutError:
+            logging.warning(
+                f"Speaker identification timed out after {SPEAKER_ID_TIMEOUT}s; the Azure call keeps its pool thread until it returns"
+            )
             return None
+
+    @cache_by_fingerprint()
+    def identify_speaker(self, audio_stream: bytes) -> Optional[Speaker]:
+        try:
+            audio_stream = strip_non_speech(audio_stream)
+            if not audio_stream:
+                return None
+
+            future = self._submit_identification(audio_stream)
+            if future is None:
+                return None
+            profile_id = self._identification_result(future)
+            return self.speakers.get(profile_id) if profile_id else None
         except Exception as e:
-            logging.error(f"Error identifying speaker: {str(e)}")
+            logging.error(f"Error identifying speaker: {str(e) or type(e).__name__}")
             return None
 
+    @cache_by_fingerprint()
     def transcribe_audio(self, audio_stream: bytes) -> Optional[str]:
         try:
-            stream = speechsdk.audio.PushAudioInputStream()
-            stream.write(audio_stream)
-            audio_config = speechsdk.audio.AudioConfig(stream=stream)
+            audio_config = pull_audio_config(audio_stream)
             speech_recognizer = speechsdk.SpeechRecognizer(self.speech_config, audio_config)
 
             result = speech_recognizer.recognize_once_async().get()
@@ -150,36 +378,127 @@ class SpeakerRecognitionSystem:
             logging.error(f"Error transcribing audio: {str(e)}")
             return None
 
+    # A missing speaker may be a throttled or cancelled identification, so it
+    # only gets the short failure TTL even when the transcription succeeded
+    @cache_by_fingerprint(failed=lambda result: result[0] is None or result[1] is None)
+    def transcribe_and_identify(self, audio: bytes) -> Tuple[Optional[str], Optional[Speaker]]:
+        try:
+            speech_recognizer = speechsdk.SpeechRecognizer(self.speech_config, pull_audio_config(audio))
+
+            # Both requests are started before waiting on either, so the two
+            # round-trips to Azure overlap instead of running back to back.
+            speech_future = speech_recognizer.recognize_once_async()
+        except Exception as e:
+            logging.error(f"Error transcribing audio: {str(e)}")
+            return None, None
+
+        # Identification errors are handled on their own so a failed
+        # identification still leaves the clip transcribed, as "Unknown"
+        speaker_future = None
+        try:
+            # Transcription keeps the pauses between words; identification
+            # only needs the voiced frames
+            speech_audio = strip_non_speech(audio)
+            if speech_audio:
+                speaker_future = self._submit_identification(speech_audio)
+        except Exception as e:
+            logging.error(f"Error identifying speaker: {str(e)}")
+
+        try:
+            speech_result = speech_future.get()
+        except Exception as e:
+            logging.error(f"Error transcribing audio: {str(e)}")
+            return None, None
+
+        text = None
+        if speech_result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            text = speech_result.text
+
+        speaker = None
+        if speaker_future:
+            try:
+                profile_id = self._identification_result(speaker_future)
+                speaker = self.speakers.get(profile_id) if profile_id else None
+            except Exception as e:
+                logging.error(f"Error identifying speaker: {str(e) or type(e).__name__}")
+
+        return text, speaker
+
     def add_transcript_entry(self, text: str, speaker_name: Optional[str] = None):
+        now = datetime.now()
         entry = TranscriptEntry(
-            timestamp=datetime.now().timestamp(),
+            timestamp=now.timestamp(),
             text=text,
-            speaker=speaker_name
+            speaker=speaker_name,
+            formatted_time=now.strftime('%H:%M:%S')
         )
         self.transcript.append(entry)
+        self._entries_added += 1
 
     def get_formatted_transcript(self) -> List[Dict]:
-        formatted_entries = []
-        for entry in self.transcript:
-            formatted_entry = {
-                'timestamp': datetime.fromtimestamp(entry.timestamp).strftime('%H:%M:%S'),
-                'text': entry.text,
-                'speaker': entry.speaker if entry.speaker else 'Not recognized'
-            }
-            formatted_entries.append(formatted_entry)
-        return formatted_entries
-
-
-# Flask application setup
-app = Flask(__name__)
+        # Entries never change once added, so only format the ones appended
+        # since the last call, walking back from the newest
+        new_entries = min(self._entries_added - self._entries_formatted, len(self.transcript))
+        if new_entries:
+            self._formatted_cache.extend(
+                {
+                    'timestamp': entry.formatted_time,
+                    'text': entry.text,
+                    'speaker': entry.speaker if entry.speaker else 'Not recognized'
+                }
+                for entry in reversed(list(islice(reversed(self.transcript), new_entries)))
+            )
+            self._entries_formatted = self._entries_added
+
+            # Keep the formatted view in step with the entries the deque dropped
+            overflow = len(self._formatted_cache) - len(self.transcript)
+            if overflow > 0:
+                del self._formatted_cache[:overflow]
+        return self._formatted_cache
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    # orjson encodes straight to bytes in C, which matters for the transcript
+    # endpoint whose payload grows with every processed clip
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        # orjson.loads has no options, so json.loads keyword arguments such as
+        # object_hook can't be honoured; refuse them rather than drop them
+        if kwargs:
+            raise TypeError(f"OrjsonProvider.loads() does not support {', '.join(kwargs)}")
+        return orjson.loads(s)
+
+
+# Quart application setup (async Flask API). In production serve it with
+#   hypercorn app:app --worker-class asyncio
+# gunicorn's default WSGI workers can't run it.
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+
+# Quart caps request bodies at 16 MiB by default, where Flask had no limit.
+# Allow about ten minutes of 44.1 kHz stereo WAV; bigger uploads get a 413.
+# Bodies must also arrive within BODY_TIMEOUT seconds.
+app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024
+app.config['BODY_TIMEOUT'] = 120
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 
 # Initialize the speaker recognition system
-AZURE_SPEECH_KEY = '1AuqtBBihDvY4gARgN3Uv8VBxjX7PcwOGVXElhjrSQ5BPG1TEDWKJQQJ99ALACYeBjFXJ3w3AAAAACOGRdLo'
-AZURE_SPEECH_REGION = 'eastus'
-speaker_system = SpeakerRecognitionSystem(AZURE_SPEECH_KEY, AZURE_SPEECH_REGION)
+# Credentials come from the environment (or a local .env file), never the source
+load_dotenv()
+AZURE_SPEECH_KEY = os.environ['AZURE_SPEECH_KEY']
+AZURE_SPEECH_REGION = os.environ.get('AZURE_SPEECH_REGION', 'eastus')
+# Built once and shared by every recognizer and client; the SDK only reads it
+SPEECH_CONFIG = speechsdk.SpeechConfig(subscription=AZURE_SPEECH_KEY, region=AZURE_SPEECH_REGION)
+speaker_system = SpeakerRecognitionSystem(SPEECH_CONFIG)
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav'}
@@ -192,58 +511,65 @@ def allowed_file(filename):
 
 
 @app.route('/')
-def index():
-    return render_template('index.html')
+async def index():
+    return await render_template('index.html')
 
 
 @app.route('/api/start-recording', methods=['POST'])
-def start_recording():
+async def start_recording():
     return jsonify({'status': 'success', 'message': 'Recording started'})
 
 
 @app.route('/api/stop-recording', methods=['POST'])
-def stop_recording():
+async def stop_recording():
     return jsonify({'status': 'success', 'message': 'Recording stopped'})
 
 
 @app.route('/api/process-audio', methods=['POST'])
-def process_audio():
+async def process_audio():
     try:
         # Check if the audio is in the form data
-        if 'audio' not in request.files:
+        files = await request.files
+        if 'audio' not in files:
             logging.error("No audio file found in request.")
             return jsonify({'error': 'No audio file found'}), 400
 
-        audio_file = request.files['audio']
-        
-        # Log the size of the received file
-        logging.info(f"Received audio file: {audio_file.filename} of size {len(audio_file.read())} bytes")
-        
-        # Rewind to the start after reading file size
-        audio_file.seek(0)
+        audio_file = files['audio']
+
+        # The upload is already spooled to a file, so its size is a seek away
+        audio_size = audio_file.stream.seek(0, io.SEEK_END)
+        audio_file.stream.seek(0)
+        logging.info("Received audio file: %s of size %s bytes", audio_file.filename, audio_size)
 
         # Check if the file is a WAV file
         if not audio_file.filename.lower().endswith('.wav'):
             logging.error("Invalid file format. Only WAV files are accepted.")
             return jsonify({'error': 'Invalid file format. Only WAV files are accepted.'}), 400
-        
-        # Process the audio file (no need for conversion)
-        audio_data = audio_file.read()  # Read the audio data
 
-        # Log the size of the received data
-        logging.info(f"Received audio data of size: {len(audio_data)} bytes")
-
-        if not audio_data:
+        if not audio_size:
             logging.error("No audio data received.")
             return jsonify({'error': 'No audio data received'}), 400
 
-        # Process the audio data (example of handling the raw bytes)
-        text = speaker_system.transcribe_audio(audio_data)
+        # Downmix/resample to what Azure expects and drop silent edges
+        try:
+            audio_data = await asyncio.to_thread(preprocess_audio, audio_file.stream)
+        except ValueError as e:
+            logging.error(f"Could not decode WAV file: {str(e)}")
+            return jsonify({'error': 'Could not decode WAV file'}), 400
+
+        if not audio_data:
+            logging.error("Audio contained only silence.")
+            return jsonify({'error': 'No speech detected in audio'}), 400
+
+        # Transcribe and identify the speaker in one pass over the audio,
+        # off the event loop so other requests keep being served meanwhile
+        text, speaker = await asyncio.to_thread(
+            speaker_system.transcribe_and_identify, audio_data
+        )
         if not text:
             logging.error("Failed to transcribe audio.")
             return jsonify({'error': 'Failed to transcribe audio'}), 400
 
-        speaker = speaker_system.identify_speaker(audio_data)
         speaker_name = speaker.name if speaker else "Unknown"
 
         # Update the transcript
@@ -1,6 +1,10 @@
+import os
 import azure.cognitiveservices.speech as speechsdk
+from dotenv import load_dotenv
 
-speech_config = speechsdk.SpeechConfig(subscription="1AuqtBBihDvY4gARgN3Uv8VBxjX7PcwOGVXElhjrSQ5BPG1TEDWKJQQJ99ALACYeBjFXJ3w3AAAAACOGRdLo", region="eastus")
+load_dotenv()
+
+speech_config = speechsdk.SpeechConfig(subscription=os.environ['AZURE_SPEECH_KEY'], region=os.environ.get('AZURE_SPEECH_REGION', 'eastus'))
 audio_input = speechsdk.audio.AudioConfig(filename=r"C:\Users\staha\Desktop\Fiverr\Abdul K\output.wav")
 speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_input)
 